@@ -8,6 +8,7 @@ import os
 import logging
 import time
 import random
+from dataclasses import asdict
 from pathlib import Path
 from typing import Optional, Type, List
 from datetime import datetime
@@ -306,12 +307,7 @@ def init_scheduler(app: Flask, config: Type[Config]) -> BackgroundScheduler:
             
             # CRITICAL: Save following accounts to DB BEFORE initializing activity profiles
             # This ensures FK constraint is satisfied (account_activity references following_accounts)
-            storage.save_following_accounts([{
-                'user_id': acc.user_id,
-                'username': acc.username,
-                'full_name': acc.full_name,
-                'is_private': acc.is_private
-            } for acc in following_accounts])
+            storage.save_following_accounts([asdict(acc) for acc in following_accounts])
             
             logger.info(f"🔍 Fetching 1 post from each account to determine activity levels...")
             
@@ -721,3 +717,6 @@ def run_server(config: Type[Config]):
         if 'scheduler' in app.config:
             app.config['scheduler'].shutdown()
             logger.info("Background scheduler stopped")
+        # Close database connection
+        if 'storage' in app.config:
+            app.config['storage'].close()
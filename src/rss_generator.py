@@ -13,6 +13,23 @@ from xml.etree import ElementTree as ET
 logger = logging.getLogger(__name__)
 
 
+def _to_datetime(value: Any) -> datetime:
+    """Return value as a datetime, parsing ISO 8601 strings.
+    
+    StorageManager already returns datetimes, so parsing is only a fallback
+    for posts built from other sources.
+    
+    Args:
+        value: datetime or ISO 8601 string
+    
+    Returns:
+        datetime object
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
 class RSSGenerator:
     """Generates RSS 2.0 feeds from Instagram posts."""
     
@@ -109,9 +126,7 @@ class RSSGenerator:
         guid.set('isPermaLink', 'false')
         
         # PubDate - format as RFC 822
-        posted_at = post['posted_at']
-        if isinstance(posted_at, str):
-            posted_at = datetime.fromisoformat(posted_at)
+        posted_at = _to_datetime(post['posted_at'])
         ET.SubElement(item, 'pubDate').text = self._format_rfc822(posted_at)
         
         # Author
@@ -6,6 +6,7 @@ media files on the filesystem.
 
 import logging
 import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
@@ -32,49 +33,176 @@ sqlite3.register_adapter(datetime, adapt_datetime)
 sqlite3.register_converter("TIMESTAMP", convert_datetime)
 
 
+# Applied to every connection before any caller-supplied pragmas. In WAL mode
+# a commit appends to the log and, with NORMAL sync, only fsyncs at
+# checkpoints, which keeps the scheduler's many small commits cheap. The
+# trade-off: a power loss may drop the last commits, but can't corrupt the
+# file. (All access goes through one locked connection, so WAL's concurrent
+# readers aren't the reason here.)
+DEFAULT_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+
+# Statements shared by several methods. Keeping one exact string per statement
+# lets sqlite3's per-connection statement cache reuse the prepared statement
+# instead of compiling a slightly different copy at each call site.
+SQL_INSERT_POST = """
+    INSERT OR REPLACE INTO posts
+    (id, posted_at, caption, post_type, permalink,
+     author_username, author_full_name, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+SQL_DELETE_MEDIA = "DELETE FROM media WHERE post_id = ?"
+
+SQL_INSERT_MEDIA = """
+    INSERT INTO media (post_id, media_url, media_type)
+    VALUES (?, ?, ?)
+"""
+
+SQL_SELECT_POST_BY_ID = "SELECT * FROM posts WHERE id = ?"
+
+SQL_SELECT_MEDIA_FOR_POST = """
+    SELECT media_url, media_type, local_path, file_size, downloaded_at
+    FROM media
+    WHERE post_id = ?
+    ORDER BY id
+"""
+
+# Columns update_account_activity() may change, in the order they appear in
+# the generated UPDATE. A fixed order means the same set of fields always
+# yields the same SQL text, whatever order the caller passed them in.
+ACCOUNT_ACTIVITY_UPDATE_FIELDS = (
+    'media_count',
+    'last_post_id',
+    'last_post_date',
+    'last_checked',
+    'poll_priority',
+    'consecutive_no_new_posts',
+)
+
+SQL_INSERT_ACCOUNT_ACTIVITY = """
+    INSERT OR REPLACE INTO account_activity
+    (user_id, username, media_count, last_post_id, last_post_date,
+     last_checked, poll_priority, consecutive_no_new_posts, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 class StorageManager:
     """Manages SQLite database and media file storage."""
     
-    def __init__(self, db_path: str = "/data/ig2rss.db", media_dir: str = "/data/media"):
+    def __init__(
+        self,
+        db_path: str = "/data/ig2rss.db",
+        media_dir: str = "/data/media",
+        pragmas: Optional[Dict[str, Any]] = None
+    ):
         """Initialize storage manager.
         
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a
+                private in-memory database (useful for tests)
             media_dir: Base directory for media file storage
+            pragmas: Extra SQLite PRAGMAs applied to every connection on top of
+                DEFAULT_PRAGMAS, e.g. {"synchronous": "OFF"} for tests that
+                don't need durability
         """
         self.db_path = db_path
         self.media_dir = Path(media_dir)
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
         
         # Ensure directories exist
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self.media_dir.mkdir(parents=True, exist_ok=True)
         
+        # A single connection is opened once and reused by every call, which
+        # avoids re-running connection setup per query and is what keeps a
+        # ":memory:" database alive. The lock serializes access from the
+        # Flask request threads and the background scheduler.
+        self._conn = self._connect()
+        self._lock = threading.RLock()
+        self._depth = 0
+        
         logger.info(f"StorageManager initialized (db={db_path}, media={media_dir})")
         
         # Initialize database schema
         self._init_database()
     
-    @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections.
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new configured SQLite connection.
         
-        Yields:
+        Returns:
             sqlite3.Connection object
         """
         conn = sqlite3.connect(
             self.db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,  # Shared across threads, guarded by self._lock
+            cached_statements=256,
+            isolation_level=None  # Transactions are managed in _get_connection
         )
         conn.row_factory = sqlite3.Row  # Enable column access by name
         conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    @contextmanager
+    def _get_connection(self):
+        """Context manager for the shared database connection.
+        
+        The outermost block runs in an explicit transaction that commits on
+        success and rolls back otherwise. Nested blocks run in a savepoint, so
+        a failing inner block only undoes its own changes.
+        
+        The rollback also runs for KeyboardInterrupt/SystemExit and a failed
+        COMMIT, so the shared connection is never left inside a transaction.
+        
+        Yields:
+            sqlite3.Connection object
+        """
+        with self._lock:
+            savepoint = f"sp{self._depth}" if self._depth else None
+            self._conn.execute(f"SAVEPOINT {savepoint}" if savepoint else "BEGIN")
+            self._depth += 1
+            committed = False
+            try:
+                yield self._conn
+                self._conn.execute(f"RELEASE {savepoint}" if savepoint else "COMMIT")
+                committed = True
+            finally:
+                self._depth -= 1
+                if not committed and self._conn.in_transaction:
+                    if savepoint:
+                        self._conn.execute(f"ROLLBACK TO {savepoint}")
+                        self._conn.execute(f"RELEASE {savepoint}")
+                    else:
+                        self._conn.execute("ROLLBACK")
+    
+    @contextmanager
+    def transaction(self):
+        """Group several storage calls into a single transaction.
+        
+        Writes made by StorageManager methods inside the block are committed
+        together when it exits, or all rolled back if it raises.
+        
+        Example:
+            with storage.transaction():
+                storage.save_post(post)
+                storage.save_sync_metadata('last_sync', now)
+        
+        Yields:
+            This StorageManager
+        """
+        with self._get_connection():
+            yield self
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+        logger.debug(f"Closed database connection (db={self.db_path})")
     
     def _init_database(self):
         """Create database tables and indexes if they don't exist."""
@@ -281,12 +409,7 @@ class StorageManager:
                 cursor = conn.cursor()
                 
                 # Insert or replace post
-                cursor.execute("""
-                    INSERT OR REPLACE INTO posts 
-                    (id, posted_at, caption, post_type, permalink, 
-                     author_username, author_full_name, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
+                cursor.execute(SQL_INSERT_POST, (
                     post.id,
                     post.posted_at,
                     post.caption,
@@ -297,14 +420,13 @@ class StorageManager:
                 ))
                 
                 # Delete existing media entries for this post (if updating)
-                cursor.execute("DELETE FROM media WHERE post_id = ?", (post.id,))
+                cursor.execute(SQL_DELETE_MEDIA, (post.id,))
                 
-                # Insert media entries
-                for media_url, media_type in zip(post.media_urls, post.media_types):
-                    cursor.execute("""
-                        INSERT INTO media (post_id, media_url, media_type)
-                        VALUES (?, ?, ?)
-                    """, (post.id, media_url, media_type))
+                # Insert media entries in one batch
+                cursor.executemany(SQL_INSERT_MEDIA, [
+                    (post.id, media_url, media_type)
+                    for media_url, media_type in zip(post.media_urls, post.media_types)
+                ])
                 
                 logger.info(f"Saved post {post.id} with {len(post.media_urls)} media items")
                 return True
@@ -313,6 +435,60 @@ class StorageManager:
             logger.error(f"Failed to save post {post.id}: {e}")
             return False
     
+    def save_posts(self, posts: List[InstagramPost]) -> bool:
+        """Save multiple posts and their media metadata in a single transaction.
+        
+        Behaves like save_post() for each post, but batches all inserts so the
+        database only commits once. If the same post id appears more than
+        once, the last occurrence wins, as with repeated save_post() calls.
+        
+        Args:
+            posts: List of InstagramPost objects to save
+        
+        Returns:
+            True if save successful, False otherwise
+        """
+        if not posts:
+            return True
+        
+        # Keep only the last copy of each post so its media isn't inserted twice
+        posts = list({post.id: post for post in posts}.values())
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Insert or replace posts
+                cursor.executemany(SQL_INSERT_POST, [
+                    (
+                        post.id,
+                        post.posted_at,
+                        post.caption,
+                        post.post_type,
+                        post.permalink,
+                        post.author_username,
+                        post.author_full_name,
+                    )
+                    for post in posts
+                ])
+                
+                # Delete existing media entries for these posts (if updating)
+                cursor.executemany(SQL_DELETE_MEDIA, [(post.id,) for post in posts])
+                
+                # Insert media entries
+                cursor.executemany(SQL_INSERT_MEDIA, [
+                    (post.id, media_url, media_type)
+                    for post in posts
+                    for media_url, media_type in zip(post.media_urls, post.media_types)
+                ])
+                
+                logger.info(f"Saved {len(posts)} posts")
+                return True
+        
+        except Exception as e:
+            logger.error(f"Failed to save {len(posts)} posts: {e}")
+            return False
+    
     def get_media_path(self, post_id: str, media_index: int, media_type: str) -> Path:
         """Generate filesystem path for a media file.
         
@@ -401,12 +577,7 @@ class StorageManager:
                 
                 # Fetch media for each post
                 for post in posts:
-                    cursor.execute("""
-                        SELECT media_url, media_type, local_path, file_size, downloaded_at
-                        FROM media 
-                        WHERE post_id = ?
-                        ORDER BY id
-                    """, (post['id'],))
+                    cursor.execute(SQL_SELECT_MEDIA_FOR_POST, (post['id'],))
                     post['media'] = [dict(row) for row in cursor.fetchall()]
                 
                 logger.info(f"Retrieved {len(posts)} posts (limit={limit}, days={days})")
@@ -429,7 +600,7 @@ class StorageManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("SELECT * FROM posts WHERE id = ?", (post_id,))
+                cursor.execute(SQL_SELECT_POST_BY_ID, (post_id,))
                 row = cursor.fetchone()
                 
                 if not row:
@@ -438,12 +609,7 @@ class StorageManager:
                 post = dict(row)
                 
                 # Fetch media
-                cursor.execute("""
-                    SELECT media_url, media_type, local_path, file_size, downloaded_at
-                    FROM media 
-                    WHERE post_id = ?
-                    ORDER BY id
-                """, (post_id,))
+                cursor.execute(SQL_SELECT_MEDIA_FOR_POST, (post_id,))
                 post['media'] = [dict(row) for row in cursor.fetchall()]
                 
                 return post
@@ -678,23 +844,11 @@ class StorageManager:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                now = datetime.now()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO account_activity 
-                    (user_id, username, media_count, last_post_id, last_post_date,
-                     last_checked, poll_priority, consecutive_no_new_posts, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id,
-                    username,
-                    kwargs.get('media_count', 0),
-                    kwargs.get('last_post_id'),
-                    kwargs.get('last_post_date'),
-                    kwargs.get('last_checked', now),
-                    kwargs.get('poll_priority', 'normal'),
-                    kwargs.get('consecutive_no_new_posts', 0),
-                    now
-                ))
+                activity = {'user_id': user_id, 'username': username, **kwargs}
+                cursor.execute(
+                    SQL_INSERT_ACCOUNT_ACTIVITY,
+                    self._account_activity_row(activity, datetime.now())
+                )
                 
                 logger.debug(f"Saved activity for {username} (priority={kwargs.get('poll_priority', 'normal')})")
                 return True
@@ -703,6 +857,59 @@ class StorageManager:
             logger.error(f"Failed to save activity for {username}: {e}")
             return False
     
+    def save_account_activities(self, activities: List[Dict[str, Any]]) -> bool:
+        """Save or update several account activity records in one transaction.
+        
+        Args:
+            activities: List of dicts with user_id, username and any of the
+                optional fields accepted by save_account_activity()
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not activities:
+            return True
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                now = datetime.now()
+                cursor.executemany(SQL_INSERT_ACCOUNT_ACTIVITY, [
+                    self._account_activity_row(activity, now)
+                    for activity in activities
+                ])
+                
+                logger.debug(f"Saved activity for {len(activities)} accounts")
+                return True
+        
+        except Exception as e:
+            logger.error(f"Failed to save activity for {len(activities)} accounts: {e}")
+            return False
+    
+    @staticmethod
+    def _account_activity_row(activity: Dict[str, Any], now: datetime) -> tuple:
+        """Build the account_activity row for an activity dict, filling defaults.
+        
+        Args:
+            activity: Dict with user_id, username and optional activity fields
+            now: Timestamp used for updated_at and the default last_checked
+        
+        Returns:
+            Tuple of values matching SQL_INSERT_ACCOUNT_ACTIVITY
+        """
+        return (
+            activity['user_id'],
+            activity['username'],
+            activity.get('media_count', 0),
+            activity.get('last_post_id'),
+            activity.get('last_post_date'),
+            activity.get('last_checked', now),
+            activity.get('poll_priority', 'normal'),
+            activity.get('consecutive_no_new_posts', 0),
+            now
+        )
+    
     def update_account_activity(self, user_id: str, **kwargs) -> bool:
         """Update specific fields of an account activity record.
         
@@ -718,13 +925,9 @@ class StorageManager:
                 cursor = conn.cursor()
                 
                 # Build dynamic UPDATE query
-                update_fields = []
-                values = []
-                for key, value in kwargs.items():
-                    if key in ['media_count', 'last_post_id', 'last_post_date', 
-                              'last_checked', 'poll_priority', 'consecutive_no_new_posts']:
-                        update_fields.append(f"{key} = ?")
-                        values.append(value)
+                fields = [key for key in ACCOUNT_ACTIVITY_UPDATE_FIELDS if key in kwargs]
+                update_fields = [f"{key} = ?" for key in fields]
+                values = [kwargs[key] for key in fields]
                 
                 if not update_fields:
                     logger.warning(f"No valid fields to update for user {user_id}")
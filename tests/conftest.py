@@ -0,0 +1,78 @@
+"""Shared pytest fixtures for the storage-backed test modules."""
+
+import pytest
+
+from src.storage import StorageManager
+
+
+# Tests don't need crash durability, so skip fsyncs and on-disk journals
+FAST_PRAGMAS = {"synchronous": "OFF", "journal_mode": "MEMORY", "temp_store": "MEMORY"}
+
+
+def _empty_storage(storage):
+    """Delete every row from every table in a shared test database.
+    
+    Tables are read from sqlite_master so ones added to the schema later are
+    emptied too. FK checks are deferred to the commit, by which point every
+    table is empty, so the delete order doesn't matter.
+    """
+    with storage._get_connection() as conn:
+        conn.execute("PRAGMA defer_foreign_keys = ON")
+        tables = [
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        for table in tables:
+            conn.execute(f"DELETE FROM {table}")
+    return storage
+
+
+@pytest.fixture(scope="session")
+def fast_pragmas():
+    """Pragmas for throwaway test databases."""
+    return dict(FAST_PRAGMAS)
+
+
+@pytest.fixture(scope="session")
+def fk_session_storage(tmp_path_factory):
+    """In-memory StorageManager with foreign keys enforced, as in production.
+    
+    Session scoped; under pytest-xdist each worker process builds its own.
+    """
+    storage = StorageManager(
+        db_path=":memory:",
+        media_dir=str(tmp_path_factory.mktemp("media")),
+        pragmas=FAST_PRAGMAS
+    )
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def fk_storage(fk_session_storage):
+    """Shared FK-enforcing StorageManager, emptied before each test."""
+    return _empty_storage(fk_session_storage)
+
+
+@pytest.fixture(scope="session")
+def polling_session_storage(tmp_path_factory):
+    """In-memory StorageManager with foreign keys disabled, for polling tests.
+
+    Those tests save activity rows without matching following_accounts rows,
+    which the account_activity foreign key would otherwise reject.
+    """
+    storage = StorageManager(
+        db_path=":memory:",
+        media_dir=str(tmp_path_factory.mktemp("media")),
+        pragmas={**FAST_PRAGMAS, "foreign_keys": "OFF"}
+    )
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def polling_storage(polling_session_storage):
+    """Shared FK-free StorageManager, emptied before each test."""
+    return _empty_storage(polling_session_storage)
@@ -3,54 +3,15 @@
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock
-from pathlib import Path
-import tempfile
 
 from src.account_polling_manager import AccountPollingManager
-from src.storage import StorageManager
 from src.following_manager import FollowedAccount
 
 
 @pytest.fixture
-def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
-    yield db_path
-    Path(db_path).unlink(missing_ok=True)
-
-
-@pytest.fixture
-def storage(temp_db):
-    """Create a StorageManager with temporary database and FK constraints disabled."""
-    import sqlite3
-    from contextlib import contextmanager
-    
-    storage = StorageManager(db_path=temp_db, media_dir=tempfile.mkdtemp())
-    
-    # Patch _get_connection to disable FK constraints
-    original_get_connection = storage._get_connection
-    
-    @contextmanager
-    def patched_get_connection():
-        conn = sqlite3.connect(
-            storage.db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        conn.row_factory = sqlite3.Row
-        # Do NOT enable FK constraints for testing
-        conn.execute("PRAGMA foreign_keys = OFF")
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-    
-    storage._get_connection = patched_get_connection
-    return storage
+def storage(polling_storage):
+    """Polling tests seed activity rows directly, so FKs are off."""
+    return polling_storage
 
 
 @pytest.fixture
@@ -112,28 +73,18 @@ class TestAccountPollingManager:
         polling_manager.increment_cycle()
         assert polling_manager.current_cycle == 2
     
-    def test_calculate_initial_priority_no_posts(self, polling_manager):
-        """Test initial priority calculation for account with no posts."""
-        priority = polling_manager._calculate_initial_priority(None)
-        assert priority == 'dormant'
-    
-    def test_calculate_initial_priority_recent(self, polling_manager):
-        """Test initial priority for recently active account."""
-        recent_date = datetime.now() - timedelta(days=5)
-        priority = polling_manager._calculate_initial_priority(recent_date)
-        assert priority == 'normal'  # Conservative initial
-    
-    def test_calculate_initial_priority_medium(self, polling_manager):
-        """Test initial priority for moderately active account."""
-        medium_date = datetime.now() - timedelta(days=60)
-        priority = polling_manager._calculate_initial_priority(medium_date)
-        assert priority == 'low'
-    
-    def test_calculate_initial_priority_old(self, polling_manager):
-        """Test initial priority for dormant account."""
-        old_date = datetime.now() - timedelta(days=200)
-        priority = polling_manager._calculate_initial_priority(old_date)
-        assert priority == 'dormant'
+    @pytest.mark.parametrize("days_ago, expected", [
+        (None, 'dormant'),  # No posts
+        (5, 'normal'),      # Recently active, conservative initial
+        (60, 'low'),        # Moderately active
+        (200, 'dormant'),   # Old posts only
+    ])
+    def test_calculate_initial_priority(self, polling_manager, days_ago, expected):
+        """Test initial priority calculation from last post age."""
+        last_post_date = None if days_ago is None else datetime.now() - timedelta(days=days_ago)
+        
+        priority = polling_manager._calculate_initial_priority(last_post_date)
+        assert priority == expected
     
     def test_initialize_activity_profiles(self, polling_manager, storage):
         """Test initialization of activity profiles."""
@@ -165,12 +116,9 @@ class TestAccountPollingManager:
         dormant_activity = storage.get_account_activity('2')
         assert dormant_activity['poll_priority'] == 'dormant'
     
-    def test_initialize_with_priority_overrides(self, storage):
+    def test_initialize_with_priority_overrides(self, polling_manager, storage):
         """Test initialization with priority overrides."""
-        manager = AccountPollingManager(
-            storage=storage,
-            priority_overrides=['forced_high']
-        )
+        polling_manager.priority_overrides = {'forced_high'}
         
         accounts = [
             FollowedAccount(user_id='1', username='forced_high'),
@@ -182,7 +130,7 @@ class TestAccountPollingManager:
             'normal_user': []
         }
         
-        distribution = manager.initialize_activity_profiles(accounts, posts_by_account)
+        distribution = polling_manager.initialize_activity_profiles(accounts, posts_by_account)
         
         # forced_high should be high despite no posts
         forced_activity = storage.get_account_activity('1')
@@ -234,7 +182,13 @@ class TestAccountPollingManager:
         assert len(accounts) == 1
         assert accounts[0]['username'] == 'low_user'
     
-    def test_get_accounts_to_poll_dormant_priority(self, polling_manager, storage):
+    @pytest.mark.parametrize("cycle, polled", [
+        (1, False),
+        (11, False),  # Last skipped cycle
+        (12, True),   # Every 12th cycle
+        (24, True),
+    ])
+    def test_get_accounts_to_poll_dormant_priority(self, polling_manager, storage, cycle, polled):
         """Test dormant priority polling frequency."""
         storage.save_account_activity(
             user_id='1',
@@ -243,28 +197,26 @@ class TestAccountPollingManager:
             last_checked=datetime.now()
         )
         
-        # Cycles 1-11: dormant not polled
-        for i in range(11):
-            polling_manager.increment_cycle()
-            accounts = polling_manager.get_accounts_to_poll_this_cycle()
-            assert len(accounts) == 0
-        
-        # Cycle 12: dormant polled
+        # Jump straight to the cycle under test; cycle stepping itself is
+        # covered by test_increment_cycle and the low priority test
+        polling_manager.current_cycle = cycle - 1
         polling_manager.increment_cycle()
         accounts = polling_manager.get_accounts_to_poll_this_cycle()
-        assert len(accounts) == 1
-        assert accounts[0]['username'] == 'dormant_user'
+        
+        assert [a['username'] for a in accounts] == (['dormant_user'] if polled else [])
     
     def test_get_accounts_with_max_limit(self, polling_manager, storage):
         """Test max accounts limit."""
         # Create 5 high priority accounts
-        for i in range(5):
-            storage.save_account_activity(
-                user_id=str(i),
-                username=f'user{i}',
-                poll_priority='high',
-                last_checked=datetime.now()
-            )
+        now = datetime.now()
+        with storage.transaction():
+            for i in range(5):
+                storage.save_account_activity(
+                    user_id=str(i),
+                    username=f'user{i}',
+                    poll_priority='high',
+                    last_checked=now
+                )
         
         polling_manager.increment_cycle()
         
@@ -275,7 +227,8 @@ class TestAccountPollingManager:
     def test_update_account_priority_new_posts(self, polling_manager, storage):
         """Test priority update when new posts found."""
         # Create account with old data
-        old_date = datetime.now() - timedelta(hours=48)
+        now = datetime.now()
+        old_date = now - timedelta(hours=48)
         storage.save_account_activity(
             user_id='1',
             username='test_user',
@@ -288,7 +241,7 @@ class TestAccountPollingManager:
         metadata = {
             'media_count': 10,
             'latest_post_id': 'new_post_123',
-            'latest_post_date': datetime.now() - timedelta(days=2)
+            'latest_post_date': now - timedelta(days=2)
         }
         
         polling_manager.update_account_priority(
@@ -327,27 +280,29 @@ class TestAccountPollingManager:
     def test_refine_priority_active_account(self, polling_manager, storage):
         """Test priority refinement for active account after 24h."""
         # Create account 25 hours ago with normal priority
-        old_date = datetime.now() - timedelta(hours=25)
-        storage.save_account_activity(
-            user_id='1',
-            username='active_user',
-            poll_priority='normal',
-            last_checked=old_date,
-            last_post_date=datetime.now() - timedelta(days=3)
-        )
-        
-        # Manually set created_at in past to simulate 25h observation period
-        with storage._get_connection() as conn:
-            conn.execute(
-                "UPDATE account_activity SET created_at = ? WHERE user_id = ?",
-                (old_date, '1')
+        now = datetime.now()
+        old_date = now - timedelta(hours=25)
+        with storage.transaction():
+            storage.save_account_activity(
+                user_id='1',
+                username='active_user',
+                poll_priority='normal',
+                last_checked=old_date,
+                last_post_date=now - timedelta(days=3)
             )
+            
+            # Manually set created_at in past to simulate 25h observation period
+            with storage._get_connection() as conn:
+                conn.execute(
+                    "UPDATE account_activity SET created_at = ? WHERE user_id = ?",
+                    (old_date, '1')
+                )
         
         # Update with new post (3 days old = within 7 day high threshold)
         metadata = {
             'media_count': 10,
             'latest_post_id': 'new_123',
-            'latest_post_date': datetime.now() - timedelta(days=3)
+            'latest_post_date': now - timedelta(days=3)
         }
         
         polling_manager.update_account_priority(
@@ -364,11 +319,11 @@ class TestAccountPollingManager:
     def test_get_priority_stats(self, polling_manager, storage):
         """Test getting priority statistics."""
         # Create accounts with different priorities
-        storage.save_account_activity('1', 'user1', poll_priority='high', last_checked=datetime.now())
-        storage.save_account_activity('2', 'user2', poll_priority='high', last_checked=datetime.now())
-        storage.save_account_activity('3', 'user3', poll_priority='normal', last_checked=datetime.now())
-        storage.save_account_activity('4', 'user4', poll_priority='low', last_checked=datetime.now())
-        storage.save_account_activity('5', 'user5', poll_priority='dormant', last_checked=datetime.now())
+        now = datetime.now()
+        storage.save_account_activities([
+            {'user_id': str(i), 'username': f'user{i}', 'poll_priority': priority, 'last_checked': now}
+            for i, priority in enumerate(['high', 'high', 'normal', 'low', 'dormant'], start=1)
+        ])
         
         stats = polling_manager.get_priority_stats()
         
@@ -381,12 +336,14 @@ class TestAccountPollingManager:
     
     def test_priority_overrides_always_polled(self, storage):
         """Test that priority overrides are always polled."""
+        # Built directly so the priority_overrides argument itself is covered
         manager = AccountPollingManager(
             storage=storage,
             poll_high_every_n=1,
             poll_dormant_every_n=12,
             priority_overrides=['override_user']
         )
+        assert manager.priority_overrides == {'override_user'}
         
         # Create override account with dormant priority
         storage.save_account_activity(
@@ -50,6 +50,9 @@ def app(test_config):
         app = create_app(test_config)
         app.config['TESTING'] = True
         yield app
+    
+    # StorageManager holds one connection open until closed
+    app.config['storage'].close()
 
 
 @pytest.fixture
@@ -68,11 +71,12 @@ def storage(app):
 def sample_posts(storage):
     """Create sample posts in database."""
     posts = []
+    now = datetime.now()
     
     for i in range(5):
         post = InstagramPost(
             id=f"post_{i}",
-            posted_at=datetime.now() - timedelta(days=i),
+            posted_at=now - timedelta(days=i),
             caption=f"Test post {i}\nWith multiple lines",
             post_type="image",
             permalink=f"https://instagram.com/p/post_{i}",
@@ -287,6 +291,7 @@ class TestBackgroundSync:
             
             # Clean up
             scheduler.shutdown()
+            app.config['storage'].close()
     
     @patch('src.api.InstagramClient')
     @patch('requests.get')
@@ -319,9 +324,7 @@ class TestBackgroundSync:
         mock_response.raise_for_status = MagicMock()
         mock_requests_get.return_value = mock_response
         
-        # Import and run sync function
-        from src.api import init_scheduler
-        
+        # Run sync steps manually
         with app.app_context():
             # Manually trigger sync (instead of waiting for scheduler)
             config = app.config['app_config']
@@ -353,6 +356,8 @@ class TestConfiguration:
             # Should default to localhost
             rss_gen = app.config['rss_generator']
             assert 'localhost' in rss_gen.base_url or '0.0.0.0' in rss_gen.base_url
+            
+            app.config['storage'].close()
     
     def test_app_with_custom_base_url(self, test_config):
         """Test app creation with custom BASE_URL."""
@@ -361,6 +366,8 @@ class TestConfiguration:
             
             rss_gen = app.config['rss_generator']
             assert rss_gen.base_url == 'https://custom.example.com'
+            
+            app.config['storage'].close()
 
 
 class TestErrorHandling:
@@ -1,40 +1,55 @@
 """Tests for FollowingManager."""
 
 import pytest
-from datetime import datetime, timedelta
+from dataclasses import asdict
+from datetime import timedelta
 from unittest.mock import Mock, MagicMock, patch
-from pathlib import Path
-import tempfile
-import sqlite3
 
 from src.following_manager import FollowingManager, FollowedAccount
-from src.storage import StorageManager
 from src.instagram_client import InstagramClient
 
 
+class FakeInstagramClient:
+    """Stand-in for InstagramClient exposing only what FollowingManager uses.
+    
+    Much cheaper to build per test than Mock(spec=InstagramClient), which
+    introspects the whole class; test_fake_client_matches_instagram_client
+    keeps the two in step.
+    """
+    
+    def __init__(self):
+        self._is_authenticated = True
+        self.login = Mock(return_value=True)
+        self.client = Mock()
+        self.client.user_id = 12345
+
+
+def _make_accounts(*ids):
+    """Build save_following_accounts() payloads for numbered test users."""
+    return [
+        asdict(FollowedAccount(user_id=str(i), username=f'user{i}', full_name=f'User {i}'))
+        for i in ids
+    ]
+
+
 @pytest.fixture
-def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
-    yield db_path
-    Path(db_path).unlink(missing_ok=True)
+def storage(fk_storage):
+    """Foreign keys stay on so unfollow cascades behave as in production."""
+    return fk_storage
 
 
 @pytest.fixture
-def storage(temp_db):
-    """Create a StorageManager with temporary database."""
-    return StorageManager(db_path=temp_db, media_dir=tempfile.mkdtemp())
+def persisted_accounts(storage):
+    """Two following accounts already saved to storage."""
+    accounts = _make_accounts(1, 2)
+    storage.save_following_accounts(accounts)
+    return accounts
 
 
 @pytest.fixture
 def mock_instagram_client():
-    """Create a mock Instagram client."""
-    client = Mock(spec=InstagramClient)
-    client._is_authenticated = True
-    client.client = Mock()
-    client.client.user_id = 12345
-    return client
+    """Create a fake Instagram client."""
+    return FakeInstagramClient()
 
 
 @pytest.fixture
@@ -75,6 +90,15 @@ class TestFollowedAccount:
         assert account.is_private is False
 
 
+def test_fake_client_matches_instagram_client():
+    """Test every attribute of the fake exists on a real InstagramClient."""
+    with patch("src.instagram_client.Client"):
+        real = InstagramClient("test_user", "test_pass")
+    
+    for name in vars(FakeInstagramClient()):
+        assert hasattr(real, name), name
+
+
 class TestFollowingManager:
     """Tests for FollowingManager."""
     
@@ -88,34 +112,30 @@ class TestFollowingManager:
         """Test cache freshness check when no cache exists."""
         assert following_manager._is_cache_fresh() is False
     
-    def test_is_cache_fresh_with_fresh_cache(self, following_manager, storage):
+    def test_is_cache_fresh_with_fresh_cache(self, following_manager, persisted_accounts):
         """Test cache freshness check with fresh cache."""
-        # Save some accounts
-        accounts = [
-            {'user_id': '1', 'username': 'user1', 'full_name': 'User 1', 'is_private': False}
-        ]
-        storage.save_following_accounts(accounts)
-        
         # Cache should be fresh
         assert following_manager._is_cache_fresh() is True
     
-    def test_is_cache_fresh_with_stale_cache(self, following_manager, storage, temp_db):
+    def test_is_cache_fresh_with_stale_cache(self, following_manager, storage, monkeypatch):
         """Test cache freshness check with stale cache."""
-        # Manually insert an old cache entry
-        conn = sqlite3.connect(temp_db)
-        cursor = conn.cursor()
-        
-        old_time = datetime.now() - timedelta(hours=25)
-        cursor.execute("""
-            INSERT INTO following_accounts (user_id, username, full_name, is_private, last_checked)
-            VALUES (?, ?, ?, ?, ?)
-        """, ('1', 'user1', 'User 1', False, old_time))
-        conn.commit()
-        conn.close()
+        # Report a cache older than the 24h TTL; the fresh cache test above
+        # covers reading the age from real storage
+        monkeypatch.setattr(storage, 'get_following_cache_age', lambda: timedelta(hours=25))
         
         # Cache should be stale
         assert following_manager._is_cache_fresh() is False
     
+    def test_unfollowed_account_activity_cascades(self, storage, persisted_accounts):
+        """Test dropping an account from the cache removes its activity row."""
+        for account in persisted_accounts:
+            storage.save_account_activity(user_id=account['user_id'], username=account['username'])
+        
+        storage.save_following_accounts(persisted_accounts[:1])
+        
+        assert storage.get_account_activity('1') is not None
+        assert storage.get_account_activity('2') is None
+    
     def test_refresh_following_list_success(self, following_manager, mock_instagram_client, storage):
         """Test successful refresh of following list from API."""
         # Mock the API response
@@ -144,10 +164,7 @@ class TestFollowingManager:
         # Check saved accounts
         accounts = storage.get_following_accounts()
         assert len(accounts) == 2
-        
-        usernames = {acc['username'] for acc in accounts}
-        assert 'alice' in usernames
-        assert 'bob' in usernames
+        assert {acc['username'] for acc in accounts} == {'alice', 'bob'}
     
     def test_refresh_following_list_api_error(self, following_manager, mock_instagram_client):
         """Test refresh handling when API fails."""
@@ -157,30 +174,29 @@ class TestFollowingManager:
         
         assert result is False
     
-    def test_get_following_list_with_fresh_cache(self, following_manager, storage):
+    def test_get_following_list_with_fresh_cache(
+        self, following_manager, storage, persisted_accounts
+    ):
         """Test getting following list when cache is fresh."""
-        # Pre-populate cache
-        accounts = [
-            {'user_id': '1', 'username': 'user1', 'full_name': 'User 1', 'is_private': False},
-            {'user_id': '2', 'username': 'user2', 'full_name': 'User 2', 'is_private': True}
-        ]
-        storage.save_following_accounts(accounts)
-        
-        # Get list (should use cache)
-        result = following_manager.get_following_list(refresh=False)
+        # Get list (should use cache without refreshing or rewriting it)
+        with patch.object(following_manager, 'refresh_following_list') as refresh, \
+                patch.object(storage, 'save_following_accounts') as save:
+            result = following_manager.get_following_list(refresh=False)
         
-        assert len(result) == 2
-        assert isinstance(result[0], FollowedAccount)
-        assert result[0].username in ['user1', 'user2']
+        assert len(result) == len(persisted_accounts)
+        assert all(isinstance(acc, FollowedAccount) for acc in result)
+        assert {acc.username for acc in result} == {acc['username'] for acc in persisted_accounts}
         
         # Should not call API
+        refresh.assert_not_called()
+        save.assert_not_called()
         following_manager.instagram_client.client.user_following.assert_not_called()
     
     def test_get_following_list_force_refresh(self, following_manager, mock_instagram_client, storage):
         """Test getting following list with forced refresh."""
         # Pre-populate cache
         storage.save_following_accounts([
-            {'user_id': '1', 'username': 'old_user', 'full_name': 'Old', 'is_private': False}
+            asdict(FollowedAccount(user_id='1', username='old_user', full_name='Old'))
         ])
         
         # Mock new API response
@@ -215,7 +231,7 @@ class TestFollowingManager:
         """Test that stale cache is used when refresh fails."""
         # Pre-populate cache
         storage.save_following_accounts([
-            {'user_id': '1', 'username': 'cached_user', 'full_name': 'Cached', 'is_private': False}
+            asdict(FollowedAccount(user_id='1', username='cached_user', full_name='Cached'))
         ])
         
         # Make cache stale (mock the check)
@@ -1,9 +1,6 @@
 """Integration test demonstrating Instagram client + Storage layer working together."""
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
 from datetime import datetime
 from unittest.mock import Mock, patch
 
@@ -11,20 +8,18 @@ from src.instagram_client import InstagramClient, InstagramPost
 from src.storage import StorageManager
 
 
+# Fixed post timestamp; nothing here filters by age, so it needn't track the clock
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
 @pytest.fixture
-def temp_storage():
+def temp_storage(tmp_path, fast_pragmas):
     """Create a temporary storage manager for testing."""
-    temp_dir = tempfile.mkdtemp()
-    
-    db_path = Path(temp_dir) / "test.db"
-    media_dir = Path(temp_dir) / "media"
-    
-    storage = StorageManager(str(db_path), str(media_dir))
-    
+    storage = StorageManager(
+        str(tmp_path / "test.db"), str(tmp_path / "media"), pragmas=fast_pragmas
+    )
     yield storage
-    
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    storage.close()
 
 
 @pytest.fixture
@@ -72,9 +67,6 @@ def test_fetch_and_store_posts(mock_instagram_client, temp_storage):
             result = temp_storage.save_post(posts[0])
             assert result is True
             
-            # Verify the post was stored
-            assert temp_storage.post_exists(posts[0].id) is True
-            
             # Retrieve the post from storage
             stored_post = temp_storage.get_post_by_id(posts[0].id)
             assert stored_post is not None
@@ -88,7 +80,7 @@ def test_fetch_store_and_download_media(mock_instagram_client, temp_storage):
     # Create a mock post
     post = InstagramPost(
         id="9876543210",
-        posted_at=datetime.now(),
+        posted_at=NOW,
         caption="Post with media",
         post_type="photo",
         permalink="https://instagram.com/p/XYZ/",
@@ -134,7 +126,7 @@ def test_duplicate_post_handling(mock_instagram_client, temp_storage):
     """Integration test: verify duplicate posts are handled correctly."""
     post = InstagramPost(
         id="duplicate_test",
-        posted_at=datetime.now(),
+        posted_at=NOW,
         caption="Original caption",
         post_type="photo",
         permalink="https://instagram.com/p/DUP/",
@@ -145,14 +137,11 @@ def test_duplicate_post_handling(mock_instagram_client, temp_storage):
     )
     
     # Save post first time
-    temp_storage.save_post(post)
-    
-    # Check it exists
-    assert temp_storage.post_exists(post.id) is True
+    assert temp_storage.save_post(post) is True
     
     # Modify post and save again
     post.caption = "Updated caption"
-    temp_storage.save_post(post)
+    assert temp_storage.save_post(post) is True
     
     # Verify only one post exists (not duplicated)
     stats = temp_storage.get_stats()
@@ -170,7 +159,7 @@ def test_full_workflow_multiple_posts(mock_instagram_client, temp_storage):
     for i in range(3):
         post = InstagramPost(
             id=f"post_{i}",
-            posted_at=datetime.now(),
+            posted_at=NOW,
             caption=f"Post {i}",
             post_type="photo",
             permalink=f"https://instagram.com/p/{i}/",
@@ -181,10 +170,13 @@ def test_full_workflow_multiple_posts(mock_instagram_client, temp_storage):
         )
         posts.append(post)
     
-    # Store all posts
-    for post in posts:
-        result = temp_storage.save_post(post)
-        assert result is True
+    # Store all posts in a single transaction
+    result = temp_storage.save_posts(posts)
+    assert result is True
+    
+    with temp_storage._get_connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    assert count == 3
     
     # Verify all posts are stored
     recent_posts = temp_storage.get_recent_posts(limit=10)
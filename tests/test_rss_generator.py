@@ -1,16 +1,103 @@
 """Unit tests for RSS feed generator."""
 
+import io
 import pytest
-from datetime import datetime
-from xml.etree import ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    # lxml parses considerably faster; the tests only use the shared
+    # ElementTree API so the stdlib parser remains a drop-in fallback.
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
 
 from src.rss_generator import RSSGenerator
 
 
+SAMPLE_DT = datetime(2025, 12, 8, 10, 30, 0)
+EXPECTED_PUBDATE = "Mon, 08 Dec 2025 10:30:00 +0000"
+
+if hasattr(ET, 'XPath'):
+    # lxml: compile the item selector once rather than per find() call
+    _find_items = ET.XPath('channel/item')
+else:
+    def _find_items(root):
+        """Return the channel items of a parsed feed."""
+        return list(root.iterfind('channel/item'))
+
+# Compiled once per module; schema validation needs lxml, the stdlib
+# parser has no XSD support
+_RSS_SCHEMA_PATH = Path(__file__).parent / 'data' / 'rss2.xsd'
+_RSS_SCHEMA = ET.XMLSchema(ET.parse(str(_RSS_SCHEMA_PATH))) if hasattr(ET, 'XMLSchema') else None
+
+
+def assert_valid_rss(feed_xml):
+    """Validate a generated feed against the bundled RSS 2.0 schema."""
+    if _RSS_SCHEMA is None:
+        pytest.skip("RSS schema validation requires lxml")
+    _RSS_SCHEMA.assertValid(ET.fromstring(feed_xml))
+
+
+def _iter_items(feed_xml):
+    """Stream the items of a generated feed without building the whole tree.
+    
+    Each item is cleared once the caller moves on to the next one.
+    """
+    for _, elem in ET.iterparse(io.BytesIO(feed_xml), events=('end',)):
+        if elem.tag == 'item':
+            yield elem
+            elem.clear()
+
+
+_BASE_POST = {
+    'id': '12345',
+    'posted_at': SAMPLE_DT,
+    'caption': 'Test caption\nSecond line',
+    'post_type': 'image',
+    'permalink': 'https://instagram.com/p/test123',
+    'author_username': 'testuser',
+    'author_full_name': 'Test User',
+}
+
+_BASE_MEDIA = {
+    'media_type': 'image',
+    'media_url': 'https://instagram.com/image.jpg',
+    'local_path': '12345/0.jpg'
+}
+
+
+def _make_post(**overrides):
+    """Build a fresh sample post dict, safe for tests to mutate.
+    
+    Args:
+        **overrides: Fields to replace in the sample post
+    """
+    return _BASE_POST | {'media': [dict(_BASE_MEDIA)]} | overrides
+
+
+def _make_posts(n):
+    """Build n distinct posts, newest first, for feed scale tests.
+    
+    The generator only reads posts, so all of them share one media list
+    instead of allocating a copy per post.
+    """
+    media = [dict(_BASE_MEDIA)]
+    return [
+        _BASE_POST | {
+            'id': str(i),
+            'posted_at': SAMPLE_DT - timedelta(minutes=i),
+            'caption': f'Post {i}',
+            'media': media,
+        }
+        for i in range(n)
+    ]
+
+
 class TestRSSGenerator:
     """Test suite for RSSGenerator class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def generator(self):
         """Create RSSGenerator instance for testing."""
         return RSSGenerator(
@@ -22,22 +109,12 @@ class TestRSSGenerator:
     @pytest.fixture
     def sample_post(self):
         """Sample post data for testing."""
-        return {
-            'id': '12345',
-            'posted_at': datetime(2025, 12, 8, 10, 30, 0),
-            'caption': 'Test caption\nSecond line',
-            'post_type': 'image',
-            'permalink': 'https://instagram.com/p/test123',
-            'author_username': 'testuser',
-            'author_full_name': 'Test User',
-            'media': [
-                {
-                    'media_type': 'image',
-                    'media_url': 'https://instagram.com/image.jpg',
-                    'local_path': '12345/0.jpg'
-                }
-            ]
-        }
+        return _make_post()
+    
+    @pytest.fixture(scope="module")
+    def feed_xml(self, generator):
+        """Feed generated once from the unmodified sample post."""
+        return generator.generate_feed([_make_post()])
     
     def test_init(self, generator):
         """Test RSSGenerator initialization."""
@@ -54,10 +131,8 @@ class TestRSSGenerator:
         )
         assert gen.base_url == "https://example.com"
     
-    def test_generate_feed_basic(self, generator, sample_post):
+    def test_generate_feed_basic(self, feed_xml):
         """Test basic feed generation."""
-        feed_xml = generator.generate_feed([sample_post])
-        
         # Parse XML
         root = ET.fromstring(feed_xml)
         
@@ -69,9 +144,8 @@ class TestRSSGenerator:
         channel = root.find('channel')
         assert channel is not None
     
-    def test_generate_feed_channel_metadata(self, generator, sample_post):
+    def test_generate_feed_channel_metadata(self, feed_xml):
         """Test channel metadata in generated feed."""
-        feed_xml = generator.generate_feed([sample_post])
         root = ET.fromstring(feed_xml)
         channel = root.find('channel')
         
@@ -84,9 +158,8 @@ class TestRSSGenerator:
         # Check lastBuildDate exists
         assert channel.find('lastBuildDate') is not None
     
-    def test_generate_feed_atom_self_link(self, generator, sample_post):
+    def test_generate_feed_atom_self_link(self, feed_xml):
         """Test atom:link self-reference in feed."""
-        feed_xml = generator.generate_feed([sample_post])
         root = ET.fromstring(feed_xml)
         channel = root.find('channel')
         
@@ -97,21 +170,19 @@ class TestRSSGenerator:
         assert atom_link.attrib['rel'] == "self"
         assert atom_link.attrib['type'] == "application/rss+xml"
     
-    def test_generate_feed_single_post(self, generator, sample_post):
+    def test_generate_feed_single_post(self, feed_xml):
         """Test feed generation with single post."""
-        feed_xml = generator.generate_feed([sample_post])
         root = ET.fromstring(feed_xml)
-        channel = root.find('channel')
         
         # Check item count
-        items = channel.findall('item')
+        items = _find_items(root)
         assert len(items) == 1
         
         # Check item content
         item = items[0]
-        assert item.find('title').text == "Test User: Test caption"
-        assert item.find('link').text == "https://instagram.com/p/test123"
-        assert item.find('guid').text == "12345"
+        assert item.findtext('title') == "Test User: Test caption"
+        assert item.findtext('link') == "https://instagram.com/p/test123"
+        assert item.findtext('guid') == "12345"
         assert item.find('guid').attrib['isPermaLink'] == "false"
     
     def test_generate_feed_multiple_posts(self, generator, sample_post):
@@ -123,20 +194,40 @@ class TestRSSGenerator:
         ]
         
         feed_xml = generator.generate_feed(posts)
-        root = ET.fromstring(feed_xml)
-        channel = root.find('channel')
+        entries = [
+            (item.findtext('title'), item.findtext('pubDate'))
+            for item in _iter_items(feed_xml)
+        ]
         
-        items = channel.findall('item')
-        assert len(items) == 3
+        assert entries == [
+            ("Test User: Post 1", EXPECTED_PUBDATE),
+            ("Test User: Post 2", EXPECTED_PUBDATE),
+            ("Test User: Post 3", EXPECTED_PUBDATE),
+        ]
+    
+    def test_generate_feed_many_posts(self, generator):
+        """Test feed generation keeps order and content at scale."""
+        posts = _make_posts(1000)
+        
+        feed_xml = generator.generate_feed(posts)
+        # Collect every field in one pass over the items
+        entries = [
+            (item.findtext('guid'), item.findtext('title'), item.findtext('pubDate'))
+            for item in _iter_items(feed_xml)
+        ]
+        guids, titles, pubdates = zip(*entries)
+        
+        assert list(guids) == [post['id'] for post in posts]
+        assert titles[0] == "Test User: Post 0"
+        assert titles[-1] == "Test User: Post 999"
+        assert pubdates[0] == EXPECTED_PUBDATE
+        assert pubdates[-1] == "Sun, 07 Dec 2025 17:51:00 +0000"
     
     def test_generate_feed_empty_posts(self, generator):
         """Test feed generation with no posts."""
         feed_xml = generator.generate_feed([])
-        root = ET.fromstring(feed_xml)
-        channel = root.find('channel')
         
-        items = channel.findall('item')
-        assert len(items) == 0
+        assert list(_iter_items(feed_xml)) == []
     
     def test_extract_title_first_line(self, generator):
         """Test title extraction from caption."""
@@ -165,37 +256,26 @@ class TestRSSGenerator:
     
     def test_format_rfc822(self, generator):
         """Test RFC 822 date formatting."""
-        dt = datetime(2025, 12, 8, 10, 30, 0)
-        rfc822 = generator._format_rfc822(dt)
-        assert rfc822 == "Mon, 08 Dec 2025 10:30:00 +0000"
+        rfc822 = generator._format_rfc822(SAMPLE_DT)
+        assert rfc822 == EXPECTED_PUBDATE
     
-    def test_post_item_pubdate(self, generator, sample_post):
-        """Test pubDate formatting in post item."""
-        feed_xml = generator.generate_feed([sample_post])
-        root = ET.fromstring(feed_xml)
-        item = root.find('.//item')
-        
-        pubdate = item.find('pubDate').text
-        assert pubdate == "Mon, 08 Dec 2025 10:30:00 +0000"
-    
-    def test_post_item_author(self, generator, sample_post):
-        """Test author formatting in post item."""
-        feed_xml = generator.generate_feed([sample_post])
-        root = ET.fromstring(feed_xml)
-        item = root.find('.//item')
-        
-        author = item.find('author').text
-        assert author == "testuser@instagram.com (Test User)"
-    
-    def test_post_item_author_no_full_name(self, generator, sample_post):
-        """Test author formatting without full name."""
-        sample_post['author_full_name'] = None
-        feed_xml = generator.generate_feed([sample_post])
-        root = ET.fromstring(feed_xml)
-        item = root.find('.//item')
-        
-        author = item.find('author').text
-        assert author == "testuser@instagram.com (testuser)"
+    @pytest.mark.parametrize("overrides, tag, expected", [
+        # pubDate formatting
+        ({}, 'pubDate', EXPECTED_PUBDATE),
+        # Datetime given as ISO string, with and without offset
+        ({'posted_at': '2025-12-08T10:30:00'}, 'pubDate', EXPECTED_PUBDATE),
+        ({'posted_at': '2025-12-08T10:30:00+00:00'}, 'pubDate', EXPECTED_PUBDATE),
+        # Author formatting, falling back to username without full name
+        ({}, 'author', "testuser@instagram.com (Test User)"),
+        ({'author_full_name': None}, 'author', "testuser@instagram.com (testuser)"),
+    ])
+    def test_post_item_field(self, generator, overrides, tag, expected):
+        """Test individual post item fields for various post variants."""
+        feed_xml = generator.generate_feed([_make_post(**overrides)])
+        
+        # Single-item feed, so matching the serialized element is enough
+        # and avoids parsing the whole document
+        assert f'<{tag}>{expected}</{tag}>'.encode() in feed_xml
     
     def test_format_description_image(self, generator, sample_post):
         """Test description formatting with image."""
@@ -301,29 +381,33 @@ class TestRSSGenerator:
         # Check line breaks converted
         assert 'Line 1<br/>Line 2<br/>Line 3' in description
     
-    def test_post_item_datetime_string(self, generator, sample_post):
-        """Test handling of datetime as ISO string."""
-        sample_post['posted_at'] = '2025-12-08T10:30:00'
-        
-        feed_xml = generator.generate_feed([sample_post])
-        root = ET.fromstring(feed_xml)
-        item = root.find('.//item')
-        
-        pubdate = item.find('pubDate').text
-        assert pubdate == "Mon, 08 Dec 2025 10:30:00 +0000"
+    @pytest.mark.parametrize("media", [
+        # Image only: enclosure falls back to the first image
+        None,
+        # Video with local file takes the enclosure
+        [
+            {'media_type': 'image', 'media_url': 'https://instagram.com/image.jpg', 'local_path': '12345/0.jpg'},
+            {'media_type': 'video', 'media_url': 'https://instagram.com/video.mp4', 'local_path': '12345/1.mp4'},
+        ],
+        # No media at all: item has no enclosure
+        [],
+    ])
+    def test_feed_matches_rss_schema(self, generator, media):
+        """Test generated feeds are valid RSS 2.0."""
+        post = _make_post() if media is None else _make_post(media=media)
+        
+        assert_valid_rss(generator.generate_feed([post]))
+    
+    def test_empty_feed_matches_rss_schema(self, generator):
+        """Test a feed without items is valid RSS 2.0."""
+        assert_valid_rss(generator.generate_feed([]))
     
-    def test_xml_declaration(self, generator, sample_post):
+    def test_xml_declaration(self, feed_xml):
         """Test XML declaration is present."""
-        feed_xml = generator.generate_feed([sample_post])
-        
         # Check starts with XML declaration
         assert feed_xml.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
     
-    def test_namespace_declaration(self, generator, sample_post):
+    def test_namespace_declaration(self, feed_xml):
         """Test XML namespace declarations."""
-        feed_xml = generator.generate_feed([sample_post])
-        root = ET.fromstring(feed_xml)
-        
         # Check atom namespace is declared (may use prefix like ns0 or atom)
-        xml_str = ET.tostring(root, encoding='unicode')
-        assert 'http://www.w3.org/2005/Atom' in xml_str
+        assert b'http://www.w3.org/2005/Atom' in feed_xml
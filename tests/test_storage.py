@@ -1,30 +1,78 @@
 """Unit tests for the storage layer."""
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 from src.storage import StorageManager
 from src.instagram_client import InstagramPost
 
 
-@pytest.fixture
-def temp_storage():
-    """Create a temporary storage manager for testing."""
-    # Create temporary directory
-    temp_dir = tempfile.mkdtemp()
-    
-    db_path = Path(temp_dir) / "test.db"
-    media_dir = Path(temp_dir) / "media"
+# Single reference time for the whole module so relative post dates never
+# drift between calls. It stays relative to the real clock because
+# get_recent_posts(days=...) computes its cutoff from datetime.now().
+NOW = datetime.now().replace(microsecond=0)
+
+# Built once; tests derive variants with _make_post() instead of spelling
+# out every field
+_POST_TEMPLATE = InstagramPost(
+    id="post",
+    posted_at=NOW,
+    caption=None,
+    post_type="photo",
+    permalink="https://instagram.com/p/xyz/",
+    author_username="user",
+    author_full_name="User",
+    media_urls=["https://example.com/1.jpg"],
+    media_types=["image"],
+)
+
+
+def _make_post(**changes):
+    """Copy _POST_TEMPLATE with the given fields replaced.
     
-    storage = StorageManager(str(db_path), str(media_dir))
+    The media lists are copied so tests can't mutate the shared template.
+    """
+    changes.setdefault('media_urls', list(_POST_TEMPLATE.media_urls))
+    changes.setdefault('media_types', list(_POST_TEMPLATE.media_types))
+    return replace(_POST_TEMPLATE, **changes)
+
+
+@pytest.fixture(scope="session")
+def rollback_session_storage(tmp_path_factory):
+    """In-memory storage with the production pragmas, shared by this module.
     
+    Unlike the conftest databases it is never emptied; temp_storage undoes
+    each test's writes instead.
+    """
+    storage = StorageManager(":memory:", str(tmp_path_factory.mktemp("media")))
     yield storage
+    storage.close()
+
+
+@pytest.fixture
+def temp_storage(rollback_session_storage):
+    """Shared in-memory storage whose changes are rolled back after each test.
     
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    The test runs inside an outer _get_connection() block, so writes made by
+    StorageManager only release nested savepoints instead of committing, and
+    the test savepoint discards them afterwards.
+    """
+    with rollback_session_storage._get_connection() as conn:
+        conn.execute("SAVEPOINT test")
+        yield rollback_session_storage
+        conn.execute("ROLLBACK TO test")
+        conn.execute("RELEASE test")
+
+
+@pytest.fixture
+def disk_storage(tmp_path, fast_pragmas):
+    """Create a storage manager backed by a database file on disk."""
+    storage = StorageManager(
+        str(tmp_path / "test.db"), str(tmp_path / "media"), pragmas=fast_pragmas
+    )
+    yield storage
+    storage.close()
 
 
 @pytest.fixture
@@ -63,31 +111,52 @@ def sample_carousel_post():
     )
 
 
-def test_database_initialization(temp_storage):
-    """Test that database tables are created correctly."""
-    with temp_storage._get_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Check posts table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='posts'
-        """)
-        assert cursor.fetchone() is not None
-        
-        # Check media table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='media'
-        """)
-        assert cursor.fetchone() is not None
-        
-        # Check indexes exist
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='index' AND name='idx_posts_posted_at'
-        """)
-        assert cursor.fetchone() is not None
+class TestSchema:
+    """Schema checks, sharing one connection block across the class."""
+    
+    @pytest.fixture(scope="class")
+    def conn(self, rollback_session_storage):
+        """Connection to the shared storage, held for the whole class."""
+        with rollback_session_storage._get_connection() as conn:
+            yield conn
+    
+    @pytest.mark.parametrize("table", [
+        "posts",
+        "media",
+        "following_accounts",
+        "account_activity",
+        "sync_metadata",
+    ])
+    def test_database_initialization(self, conn, table):
+        """Test that database tables are created correctly."""
+        # table_info reads the cached schema; it returns no rows for a
+        # missing table
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        assert columns
+    
+    def test_database_indexes(self, conn):
+        """Test that the posts indexes are created."""
+        indexes = {row['name'] for row in conn.execute("PRAGMA index_list(posts)")}
+        assert {'idx_posts_posted_at', 'idx_posts_author'} <= indexes
+
+
+def test_custom_pragmas_applied(disk_storage):
+    """Test that pragmas passed to StorageManager are set on its connection."""
+    with disk_storage._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_default_pragmas(tmp_path):
+    """Test the production connection uses WAL with NORMAL sync by default."""
+    storage = StorageManager(str(tmp_path / "test.db"), str(tmp_path / "media"))
+    try:
+        with storage._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        storage.close()
 
 
 def test_post_exists_false(temp_storage):
@@ -180,6 +249,46 @@ def test_update_existing_post(temp_storage, sample_post):
         assert count == 2
 
 
+def test_save_posts_bulk(disk_storage, sample_post, sample_carousel_post):
+    """Test saving multiple posts in a single call."""
+    result = disk_storage.save_posts([sample_post, sample_carousel_post])
+    assert result is True
+    # The outermost block committed rather than leaving a transaction open
+    assert not disk_storage._conn.in_transaction
+    
+    stats = disk_storage.get_stats()
+    assert stats['post_count'] == 2
+    assert stats['media_count'] == 4
+    
+    # Saving again replaces media rows instead of duplicating them
+    sample_post.caption = "Updated caption"
+    result = disk_storage.save_posts([sample_post])
+    assert result is True
+    
+    post = disk_storage.get_post_by_id(sample_post.id)
+    assert post['caption'] == "Updated caption"
+    assert len(post['media']) == 1
+    assert disk_storage.get_stats()['media_count'] == 4
+
+
+def test_save_posts_duplicate_ids(disk_storage, sample_post):
+    """Test a post repeated in one batch is saved once, last copy winning."""
+    updated = _make_post(id=sample_post.id, caption="Updated caption")
+    
+    assert disk_storage.save_posts([sample_post, updated]) is True
+    
+    stats = disk_storage.get_stats()
+    assert stats['post_count'] == 1
+    assert stats['media_count'] == 1
+    assert disk_storage.get_post_by_id(sample_post.id)['caption'] == "Updated caption"
+
+
+def test_save_posts_empty(disk_storage):
+    """Test saving an empty list of posts is a no-op."""
+    assert disk_storage.save_posts([]) is True
+    assert disk_storage.get_stats()['post_count'] == 0
+
+
 def test_get_media_path(temp_storage):
     """Test media file path generation."""
     path = temp_storage.get_media_path("test_post_123", 0, "image")
@@ -241,6 +350,18 @@ def test_get_post_by_id(temp_storage, sample_post):
     assert len(post['media']) == 1
 
 
+def test_posted_at_returned_as_datetime(temp_storage, sample_post):
+    """Test posted_at is converted back to datetime, not left as a string."""
+    temp_storage.save_post(sample_post)
+    
+    post = temp_storage.get_post_by_id(sample_post.id)
+    recent = temp_storage.get_recent_posts(limit=1)
+    
+    assert post['posted_at'] == sample_post.posted_at
+    assert isinstance(post['posted_at'], datetime)
+    assert isinstance(recent[0]['posted_at'], datetime)
+
+
 def test_get_post_by_id_not_found(temp_storage):
     """Test retrieving non-existent post returns None."""
     post = temp_storage.get_post_by_id("nonexistent")
@@ -250,21 +371,16 @@ def test_get_post_by_id_not_found(temp_storage):
 def test_get_recent_posts(temp_storage):
     """Test retrieving recent posts."""
     # Create multiple posts with different dates
-    posts = []
-    for i in range(5):
-        post = InstagramPost(
+    posts = [
+        _make_post(
             id=f"post_{i}",
-            posted_at=datetime.now() - timedelta(days=i),
+            posted_at=NOW - timedelta(days=i),
             caption=f"Post {i}",
-            post_type="photo",
-            permalink=f"https://instagram.com/p/{i}/",
-            author_username="testuser",
-            author_full_name="Test User",
             media_urls=[f"https://example.com/image{i}.jpg"],
-            media_types=["image"],
         )
-        posts.append(post)
-        temp_storage.save_post(post)
+        for i in range(5)
+    ]
+    temp_storage.save_posts(posts)
     
     # Get recent posts
     recent = temp_storage.get_recent_posts(limit=3)
@@ -280,43 +396,12 @@ def test_get_recent_posts_with_days_filter(temp_storage):
     """Test retrieving posts with days filter."""
     # Create posts: one today, one 5 days ago, one 10 days ago
     posts = [
-        InstagramPost(
-            id="post_today",
-            posted_at=datetime.now(),
-            caption="Today",
-            post_type="photo",
-            permalink="https://instagram.com/p/1/",
-            author_username="user1",
-            author_full_name="User 1",
-            media_urls=["https://example.com/1.jpg"],
-            media_types=["image"],
-        ),
-        InstagramPost(
-            id="post_5days",
-            posted_at=datetime.now() - timedelta(days=5),
-            caption="5 days ago",
-            post_type="photo",
-            permalink="https://instagram.com/p/2/",
-            author_username="user2",
-            author_full_name="User 2",
-            media_urls=["https://example.com/2.jpg"],
-            media_types=["image"],
-        ),
-        InstagramPost(
-            id="post_10days",
-            posted_at=datetime.now() - timedelta(days=10),
-            caption="10 days ago",
-            post_type="photo",
-            permalink="https://instagram.com/p/3/",
-            author_username="user3",
-            author_full_name="User 3",
-            media_urls=["https://example.com/3.jpg"],
-            media_types=["image"],
-        ),
+        _make_post(id="post_today", posted_at=NOW, caption="Today"),
+        _make_post(id="post_5days", posted_at=NOW - timedelta(days=5), caption="5 days ago"),
+        _make_post(id="post_10days", posted_at=NOW - timedelta(days=10), caption="10 days ago"),
     ]
     
-    for post in posts:
-        temp_storage.save_post(post)
+    temp_storage.save_posts(posts)
     
     # Get posts from last 7 days
     recent = temp_storage.get_recent_posts(limit=10, days=7)
@@ -334,8 +419,9 @@ def test_get_stats(temp_storage, sample_post, sample_carousel_post):
     assert stats['media_count'] == 0
     
     # Add posts
-    temp_storage.save_post(sample_post)
-    temp_storage.save_post(sample_carousel_post)
+    with temp_storage.transaction():
+        temp_storage.save_post(sample_post)
+        temp_storage.save_post(sample_carousel_post)
     
     stats = temp_storage.get_stats()
     assert stats['post_count'] == 2
@@ -345,6 +431,61 @@ def test_get_stats(temp_storage, sample_post, sample_carousel_post):
     assert stats['newest_post'] is not None
 
 
+def test_transaction_commits_together(disk_storage, sample_post, sample_carousel_post):
+    """Test writes inside transaction() are committed when the block exits."""
+    with disk_storage.transaction():
+        disk_storage.save_post(sample_post)
+        disk_storage.save_post(sample_carousel_post)
+    
+    # A separate connection only sees committed data
+    other = StorageManager(
+        disk_storage.db_path, str(disk_storage.media_dir), pragmas=disk_storage.pragmas
+    )
+    try:
+        assert other.get_stats()['post_count'] == 2
+    finally:
+        other.close()
+
+
+def test_transaction_rolls_back_together(disk_storage, sample_post, sample_carousel_post):
+    """Test that an error inside transaction() undoes every write in it."""
+    with pytest.raises(RuntimeError):
+        with disk_storage.transaction():
+            disk_storage.save_post(sample_post)
+            disk_storage.save_post(sample_carousel_post)
+            raise RuntimeError("abort")
+    
+    assert disk_storage.get_stats()['post_count'] == 0
+
+
+def test_interrupted_transaction_is_rolled_back(disk_storage, sample_post):
+    """Test an interrupt inside a block doesn't leave the connection mid-transaction."""
+    with pytest.raises(KeyboardInterrupt):
+        with disk_storage.transaction():
+            disk_storage.save_post(sample_post)
+            raise KeyboardInterrupt
+    
+    assert not disk_storage._conn.in_transaction
+    assert not disk_storage.post_exists(sample_post.id)
+    
+    # The next call gets a working connection instead of a nested BEGIN error
+    assert disk_storage.save_sync_metadata('last_sync', 'now') is True
+    assert disk_storage.get_stats()['post_count'] == 0
+
+
+def test_failed_save_leaves_no_partial_post(disk_storage, sample_post):
+    """Test that a save failing midway doesn't undo or leak other writes."""
+    # media_type is NOT NULL, so the media insert fails after the post row
+    broken_post = _make_post(id="broken", media_types=[None])
+    
+    with disk_storage.transaction():
+        assert disk_storage.save_post(sample_post) is True
+        assert disk_storage.save_post(broken_post) is False
+    
+    assert disk_storage.post_exists(sample_post.id)
+    assert not disk_storage.post_exists("broken")
+
+
 def test_foreign_key_cascade(temp_storage, sample_post):
     """Test that deleting a post cascades to media."""
     # Save post
@@ -358,7 +499,6 @@ def test_foreign_key_cascade(temp_storage, sample_post):
         
         # Delete post
         cursor.execute("DELETE FROM posts WHERE id = ?", (sample_post.id,))
-        conn.commit()
         
         # Verify media is also deleted (cascade)
         cursor.execute("SELECT COUNT(*) as count FROM media WHERE post_id = ?", (sample_post.id,))
@@ -366,8 +506,8 @@ def test_foreign_key_cascade(temp_storage, sample_post):
 
 
 def test_concurrent_access(temp_storage, sample_post):
-    """Test that multiple connections can access the database."""
-    # This tests the context manager works correctly
+    """Test that repeated calls can share the one persistent connection."""
+    # Each call opens and closes its own block on the shared connection
     temp_storage.save_post(sample_post)
     
     # Multiple reads should work
@@ -379,50 +519,20 @@ def test_concurrent_access(temp_storage, sample_post):
     assert post1['id'] == post2['id']
 
 
-def test_media_directory_creation(temp_storage):
-    """Test that media directories are created as needed."""
-    path = temp_storage.get_media_path("new_post", 0, "image")
-    assert path.parent.exists()
-    assert path.parent.name == "new_post"
-
-
-def test_save_post_with_null_caption(temp_storage):
-    """Test saving post with no caption."""
-    post = InstagramPost(
-        id="no_caption",
-        posted_at=datetime.now(),
-        caption=None,
-        post_type="photo",
-        permalink="https://instagram.com/p/xyz/",
-        author_username="user",
-        author_full_name="User",
-        media_urls=["https://example.com/1.jpg"],
-        media_types=["image"],
-    )
-    
-    result = temp_storage.save_post(post)
-    assert result is True
-    
-    retrieved = temp_storage.get_post_by_id("no_caption")
-    assert retrieved['caption'] is None
-
-
-def test_save_post_with_special_characters(temp_storage):
-    """Test saving post with special characters in caption."""
-    post = InstagramPost(
-        id="special_chars",
-        posted_at=datetime.now(),
-        caption="Test with emoji 🎉 and quotes \"hello\" and apostrophe's",
-        post_type="photo",
-        permalink="https://instagram.com/p/xyz/",
-        author_username="user",
-        author_full_name="User",
-        media_urls=["https://example.com/1.jpg"],
-        media_types=["image"],
-    )
+@pytest.mark.parametrize("caption", [
+    # No caption
+    None,
+    # Special characters
+    "Test with emoji 🎉 and quotes \"hello\" and apostrophe's",
+    # Multi-line with hashtags
+    "First line\nSecond line #tag",
+], ids=["null", "special_chars", "multiline"])
+def test_save_post_caption_round_trip(temp_storage, caption):
+    """Test captions are stored and returned unchanged."""
+    post = _make_post(id="caption_post", caption=caption)
     
     result = temp_storage.save_post(post)
     assert result is True
     
-    retrieved = temp_storage.get_post_by_id("special_chars")
-    assert retrieved['caption'] == post.caption
+    retrieved = temp_storage.get_post_by_id("caption_post")
+    assert retrieved['caption'] == caption